@@ -0,0 +1,17 @@
+"""
+Pytest fixtures shared by every test in the project.
+"""
+import pytest
+
+from enterprise_subsidy.apps.api_client.base_oauth import clear_shared_oauth_clients
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_oauth_clients():
+    """
+    Give every test an empty registry of shared OAuth clients, so that a test which patches
+    ``base_oauth.OAuthAPIClient`` never gets a client cached by another test.
+    """
+    clear_shared_oauth_clients()
+    yield
+    clear_shared_oauth_clients()
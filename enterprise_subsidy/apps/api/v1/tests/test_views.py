@@ -11,6 +11,7 @@ from unittest import mock
 import ddt
 from django.conf import settings
 from django.core.exceptions import MultipleObjectsReturned
+from edx_django_utils.cache import TieredCache
 from edx_rbac.utils import ALL_ACCESS_CONTEXT
 from openedx_ledger.models import Transaction, TransactionStateChoices
 from openedx_ledger.test_utils.factories import (
@@ -24,6 +25,7 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 
 from enterprise_subsidy.apps.api.v1.tests.mixins import STATIC_ENTERPRISE_UUID, STATIC_LMS_USER_ID, APITestMixin
+from enterprise_subsidy.apps.api.v1.views.content_metadata import content_summary_cache_key
 from enterprise_subsidy.apps.api_client.enterprise_catalog import EnterpriseCatalogApiClientV2
 from enterprise_subsidy.apps.subsidy.constants import SYSTEM_ENTERPRISE_ADMIN_ROLE, SYSTEM_ENTERPRISE_LEARNER_ROLE
 from enterprise_subsidy.apps.subsidy.models import RevenueCategoryChoices, Subsidy
@@ -1858,6 +1860,89 @@ class ContentMetadataViewSetTests(APITestBase):
                 },
             )
 
+    def test_cached_get_shared_across_users(self):
+        """
+        Test that the view-level cache is keyed on the customer and content, not on the requesting user,
+        so a second user with access to the same customer is served from the cache.
+        """
+        with mock.patch(
+            'enterprise_subsidy.apps.api_client.base_oauth.OAuthAPIClient',
+            return_value=mock.MagicMock()
+        ) as mock_oauth_client:
+            customer_uuid = uuid.uuid4()
+            mock_oauth_client.return_value.get.return_value = MockResponse(self.edx_course_metadata_with_runs, 200)
+            url = reverse('api:v1:content-metadata', kwargs={'content_identifier': self.content_key_3})
+            url += f'?enterprise_customer_uuid={str(customer_uuid)}'
+
+            self.set_up_admin(enterprise_uuids=[str(customer_uuid)])
+            first_response = self.client.get(url)
+            assert first_response.status_code == 200
+
+            self.set_up_learner(enterprise_uuids=[str(customer_uuid)])
+            mock_oauth_client.return_value.get.side_effect = Exception("Does not reach this")
+            second_response = self.client.get(url)
+
+            assert second_response.status_code == 200
+            assert second_response.content == first_response.content
+            assert second_response['Content-Type'] == 'application/json'
+            self.assertEqual(mock_oauth_client.return_value.get.call_count, 1)
+            cache_key = content_summary_cache_key(customer_uuid, self.content_key_3)
+            assert TieredCache.get_cached_response(cache_key).value == first_response.content
+
+    def test_conditional_get_returns_not_modified(self):
+        """
+        Test that successful responses carry an ETag and private caching headers, and that a request
+        whose If-None-Match matches the ETag gets a 304 with no body.
+        """
+        with mock.patch(
+            'enterprise_subsidy.apps.api_client.base_oauth.OAuthAPIClient',
+            return_value=mock.MagicMock()
+        ) as mock_oauth_client:
+            customer_uuid = uuid.uuid4()
+            self.set_up_admin(enterprise_uuids=[str(customer_uuid)])
+            mock_oauth_client.return_value.get.return_value = MockResponse(self.edx_course_metadata_with_runs, 200)
+            url = reverse('api:v1:content-metadata', kwargs={'content_identifier': self.content_key_3})
+            url += f'?enterprise_customer_uuid={str(customer_uuid)}'
+
+            first_response = self.client.get(url)
+            assert first_response.status_code == 200
+            etag = first_response['ETag']
+            assert etag
+            assert 'private' in first_response['Cache-Control']
+            assert 'Authorization' in first_response['Vary']
+
+            second_response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert second_response.status_code == 304
+            assert second_response.content == b''
+            assert second_response['ETag'] == etag
+
+            third_response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+            assert third_response.status_code == 200
+            assert third_response.content == first_response.content
+
+    def test_not_found_is_cached(self):
+        """
+        Test that a 404 from the catalog service is cached, so that repeated requests for
+        unknown content don't re-request the catalog service.
+        """
+        with mock.patch(
+            'enterprise_subsidy.apps.api_client.base_oauth.OAuthAPIClient',
+            return_value=mock.MagicMock()
+        ) as mock_oauth_client:
+            customer_uuid = uuid.uuid4()
+            self.set_up_admin(enterprise_uuids=[str(customer_uuid)])
+            mock_oauth_client.return_value.get.return_value = MockResponse({"something": "fail"}, 404)
+            url = reverse('api:v1:content-metadata', kwargs={'content_identifier': 'unknown_content_key'})
+            url += f'?enterprise_customer_uuid={str(customer_uuid)}'
+
+            first_response = self.client.get(url)
+            mock_oauth_client.return_value.get.side_effect = Exception("Does not reach this")
+            second_response = self.client.get(url)
+
+            assert first_response.status_code == second_response.status_code == 404
+            assert first_response.json() == second_response.json() == 'Content not found'
+            self.assertEqual(mock_oauth_client.return_value.get.call_count, 1)
+
     def test_retrieve_failure_no_permission(self):
         self.set_up_admin(enterprise_uuids=[str(uuid.uuid4())])
         url = reverse('api:v1:content-metadata', kwargs={'content_identifier': self.content_key_1})
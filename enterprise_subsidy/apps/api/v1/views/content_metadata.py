@@ -5,21 +5,25 @@ import logging
 
 import requests
 from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, set_response_etag
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import extend_schema
+from edx_django_utils.cache import TieredCache
 from edx_rbac.mixins import PermissionRequiredMixin
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import permissions
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import action
 from rest_framework.generics import GenericAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.status import HTTP_404_NOT_FOUND
 
 from enterprise_subsidy.apps.api.v1 import utils
 from enterprise_subsidy.apps.api.v1.decorators import require_at_least_one_query_parameter
 from enterprise_subsidy.apps.content_metadata.api import ContentMetadataApi
+from enterprise_subsidy.apps.core.utils import versioned_cache_key
 from enterprise_subsidy.apps.subsidy.constants import (
     ENTERPRISE_SUBSIDY_ADMIN_ROLE,
     ENTERPRISE_SUBSIDY_LEARNER_ROLE,
@@ -34,6 +38,28 @@ logger = logging.getLogger(__name__)
 
 
 CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS = getattr(settings, 'CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS', 60)
+CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS = getattr(
+    settings, 'CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS', 60 * 5,
+)
+CONTENT_METADATA_VIEW_CACHE_NAMESPACE = 'content_metadata_view'
+CONTENT_NOT_FOUND_CACHE_NAMESPACE = 'content_metadata_view_not_found'
+
+
+def content_summary_cache_key(enterprise_customer_uuid, content_identifier):
+    """
+    Returns a versioned cache key for the rendered content summary served to the given customer.
+
+    The key intentionally excludes anything about the requesting user, so that every user with
+    access to the customer shares the same cache entry.
+    """
+    return versioned_cache_key(CONTENT_METADATA_VIEW_CACHE_NAMESPACE, enterprise_customer_uuid, content_identifier)
+
+
+def content_not_found_cache_key(enterprise_customer_uuid, content_identifier):
+    """
+    Returns a versioned cache key recording that the content was not found for the given customer.
+    """
+    return versioned_cache_key(CONTENT_NOT_FOUND_CACHE_NAMESPACE, enterprise_customer_uuid, content_identifier)
 
 
 class ContentMetadataViewSet(
@@ -83,7 +109,6 @@ class ContentMetadataViewSet(
         return utils.get_enterprise_uuid_from_request_query_params(self.request)
 
     @extend_schema(parameters=[Parameters.ENTERPRISE_CUSTOMER_UUID])
-    @method_decorator(cache_page(CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS))
     @method_decorator(require_at_least_one_query_parameter('enterprise_customer_uuid'))
     @action(detail=True)
     def get(self, request, content_identifier, enterprise_customer_uuid):
@@ -106,7 +131,25 @@ class ContentMetadataViewSet(
                     via an enterprise catalog query
                 - The content metadata payload does not contain an appropriate entitlement mode and price or the
                     content's associated product source
+
+        Successful content summaries are rendered to JSON once and cached per (enterprise customer, content
+        identifier) in the django cache for ``CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS``, so they are shared
+        across users and workers, and returned as pre-rendered JSON bytes without re-rendering.
+        "Content not found" results from the catalog service are cached separately, for
+        ``CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS``.
+
+        Successful responses carry an ``ETag`` and a private ``Cache-Control`` max-age, and a request whose
+        ``If-None-Match`` matches the current summary gets a 304 with no body.
         """
+        cache_key = content_summary_cache_key(enterprise_customer_uuid[0], content_identifier)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            return self._json_response(request, cached_response.value)
+
+        not_found_cache_key = content_not_found_cache_key(enterprise_customer_uuid[0], content_identifier)
+        if TieredCache.get_cached_response(not_found_cache_key).is_found:
+            return Response("Content not found", HTTP_404_NOT_FOUND)
+
         try:
             content_summary = self.content_metadata_api().get_content_summary(
                 enterprise_customer_uuid[0],
@@ -117,6 +160,36 @@ class ContentMetadataViewSet(
                 logger.warning(f"Could not find course price in metadata for {content_identifier}")
         except requests.exceptions.HTTPError as exc:
             if exc.response.status_code == 404:
+                if CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS:
+                    TieredCache.set_all_tiers(
+                        not_found_cache_key,
+                        True,
+                        django_cache_timeout=CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS,
+                    )
                 return Response("Content not found", HTTP_404_NOT_FOUND)
             return Response(f"Failed to fetch data from catalog service with exc: {exc}", exc.response.status_code)
-        return Response(content_summary, 200)
+
+        rendered_summary = JSONRenderer().render(content_summary)
+        if CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS:
+            TieredCache.set_all_tiers(
+                cache_key,
+                rendered_summary,
+                django_cache_timeout=CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS,
+            )
+        return self._json_response(request, rendered_summary)
+
+    @staticmethod
+    def _json_response(request, rendered_summary):
+        """
+        Wrap an already-rendered JSON payload in a 200 response, or a 304 if the client's
+        ``If-None-Match`` header matches it.  ``JsonResponse`` would re-encode the payload.
+
+        The payload depends on the requester being authorized for the customer, so it may
+        only be cached privately by the client, never by a shared cache.
+        """
+        # pylint: disable=http-response-with-content-type-json
+        response = HttpResponse(rendered_summary, content_type='application/json', status=200)
+        set_response_etag(response)
+        patch_cache_control(response, private=True, max_age=CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS)
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return get_conditional_response(request, etag=response['ETag'], response=response)
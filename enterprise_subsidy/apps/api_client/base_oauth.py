@@ -2,12 +2,40 @@
 Base oauth api client for the subsidy service.
 """
 import logging
+import threading
 
 from django.conf import settings
 from edx_rest_api_client.client import OAuthAPIClient
 
 logger = logging.getLogger(__name__)
 
+_shared_oauth_clients = {}
+_shared_oauth_clients_lock = threading.Lock()
+
+
+def get_shared_oauth_client(base_url, client_id, client_secret):
+    """
+    Returns an ``OAuthAPIClient`` shared by all API clients in this process that use the same
+    base url and client id, so that its underlying ``requests.Session`` (and pool of
+    keep-alive connections) is reused across client instances.
+
+    Clients are created lazily on first use, which happens after gunicorn forks its workers,
+    so connections are never shared between processes.
+    """
+    key = (base_url, client_id)
+    with _shared_oauth_clients_lock:
+        if key not in _shared_oauth_clients:
+            _shared_oauth_clients[key] = OAuthAPIClient(base_url, client_id, client_secret)
+        return _shared_oauth_clients[key]
+
+
+def clear_shared_oauth_clients():
+    """
+    Drops every shared ``OAuthAPIClient``, so that the next API client instance builds a new one.
+    """
+    with _shared_oauth_clients_lock:
+        _shared_oauth_clients.clear()
+
 
 class ApiClientException(Exception):
     """
@@ -21,7 +49,7 @@ class BaseOAuthClient:
     """
 
     def __init__(self):
-        self.client = OAuthAPIClient(
+        self.client = get_shared_oauth_client(
             settings.SOCIAL_AUTH_EDX_OAUTH2_URL_ROOT.strip('/'),
             self.oauth2_client_id,
             self.oauth2_client_secret
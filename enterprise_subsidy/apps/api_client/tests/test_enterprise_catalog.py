@@ -4,7 +4,10 @@ from uuid import uuid4
 import ddt
 from django.test import TestCase
 
-from enterprise_subsidy.apps.api_client.enterprise_catalog import EnterpriseCatalogApiClient
+from enterprise_subsidy.apps.api_client.enterprise_catalog import (
+    EnterpriseCatalogApiClient,
+    EnterpriseCatalogApiClientV2
+)
 from test_utils.utils import MockResponse
 
 
@@ -115,3 +118,14 @@ class EnterpriseCatalogApiClientTests(TestCase):
         assert response == self.course_metadata
         assert mock_oauth_client.return_value.get.call_args.args[0] == enterprise_catalog_client.metadata_endpoint
         assert mock_oauth_client.return_value.get.call_args.kwargs == {'params': {'content_identifiers': ['edX+DemoX']}}
+
+    @mock.patch('enterprise_subsidy.apps.api_client.base_oauth.OAuthAPIClient', return_value=mock.MagicMock())
+    def test_oauth_client_shared_across_instances(self, mock_oauth_client):
+        """
+        Test that api client instances reuse one underlying OAuth session rather than opening a new one each.
+        """
+        first_client = EnterpriseCatalogApiClient()
+        second_client = EnterpriseCatalogApiClientV2()
+
+        assert first_client.client is second_client.client
+        mock_oauth_client.assert_called_once()
@@ -3,7 +3,7 @@ Python API for gathering content metadata for content identifiers
 during subsidy redemption and fulfillment.
 """
 import logging
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
 from django.conf import settings
 from edx_django_utils.cache import TieredCache
@@ -80,7 +80,8 @@ class ContentMetadataApi:
         Helper to return the "official" price for content.
         The endpoint at ``self.content_metadata_url`` will always return price fields
         as USD (dollars), possibly as a string or a float.  This method converts
-        those values to USD cents as an integer.
+        those values to USD cents as an integer, rounded to the nearest cent.  Floats are
+        read through their string form so that e.g. ``0.29`` converts to 29 cents, not 28.
         """
         content_price = None
         course_run_key = course_run_data.get('key')
@@ -92,7 +93,8 @@ class ContentMetadataApi:
         if not content_price:
             content_price = self.price_for_content_fallback(content_data, course_run_data)
 
-        return int(Decimal(content_price) * CENTS_PER_DOLLAR)
+        price_in_cents = Decimal(str(content_price)) * CENTS_PER_DOLLAR
+        return int(price_in_cents.quantize(Decimal('1'), rounding=ROUND_HALF_UP))
 
     def mode_for_content(self, content_data):
         """
@@ -404,6 +404,21 @@ class ContentMetadataApiTests(TestCase):
             'course_run_data': {},
             'expected_price': 420,
         },
+        {
+            'content_data': {},
+            'course_run_data': {'first_enrollable_paid_seat_price': 0.29},
+            'expected_price': 29,
+        },
+        {
+            'content_data': {},
+            'course_run_data': {'first_enrollable_paid_seat_price': 149.99},
+            'expected_price': 14999,
+        },
+        {
+            'content_data': {},
+            'course_run_data': {'first_enrollable_paid_seat_price': '19.995'},
+            'expected_price': 2000,
+        },
         {
             'content_data': {},
             'course_run_data': {},
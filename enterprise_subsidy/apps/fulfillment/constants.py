@@ -2,7 +2,7 @@
 Constants related to fulfillment.
 """
 
-OPEN_COURSES_COURSE_TYPES = {
+OPEN_COURSES_COURSE_TYPES = frozenset({
     'audit',
     'professional',
     'verified-audit',
@@ -12,13 +12,13 @@ OPEN_COURSES_COURSE_TYPES = {
     'honor',
     'verified-honor',
     'credit-verified-honor',
-}
+})
 
 # Everything below is technical debt that we'll have to extract
 # at some future point, due to Open edX concerns.
-EXEC_ED_2U_COURSE_TYPES = {
+EXEC_ED_2U_COURSE_TYPES = frozenset({
     'executive-education-2u',
-}
+})
 
 
 EXEC_ED_2U_FULFILLMENT_REQUEST_KWARGS = [
@@ -111,6 +111,6 @@ def can_redeem(subsidy, lms_user_id, content_key):
     else:
         is_redeemable, price_for_content = subsidy.is_redeemable(content_key)
     all_transactions_for_learner_and_content = list(
-        subsidy.transactions_for_learner_and_content(lms_user_id, content_key)
+        subsidy.transactions_for_learner_and_content(lms_user_id, content_key).prefetch_related('external_reference')
     )
     return (is_redeemable, is_active, price_for_content, all_transactions_for_learner_and_content)
@@ -9,19 +9,19 @@ Some defintions:
 * `redemption`: The act of redeeming stored value for content.
 """
 import logging
-from datetime import datetime, timezone
-from unittest import mock
+from datetime import timedelta
 from uuid import uuid4
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.functional import cached_property
+from edx_django_utils.cache import TieredCache
 from edx_rbac.models import UserRole, UserRoleAssignment
 from edx_rbac.utils import ALL_ACCESS_CONTEXT
 from model_utils.models import TimeStampedModel
 from openedx_ledger import api as ledger_api
-from openedx_ledger.models import Ledger, TransactionStateChoices, UnitChoices
+from openedx_ledger.models import Ledger, LedgerLockAttemptFailed, Transaction, TransactionStateChoices, UnitChoices
 from openedx_ledger.utils import create_idempotency_key_for_transaction
 from requests.exceptions import HTTPError
 from rest_framework import status
@@ -31,17 +31,18 @@ from enterprise_subsidy.apps.api_client.enterprise import EnterpriseApiClient
 from enterprise_subsidy.apps.api_client.lms_user import LmsUserApiClient
 from enterprise_subsidy.apps.content_metadata.api import ContentMetadataApi
 from enterprise_subsidy.apps.core import event_bus
-from enterprise_subsidy.apps.core.utils import localized_utcnow
+from enterprise_subsidy.apps.core.utils import localized_utcnow, request_cache, versioned_cache_key
 from enterprise_subsidy.apps.fulfillment.api import GEAGFulfillmentHandler
 
-MOCK_CATALOG_CLIENT = mock.MagicMock()
-MOCK_ENROLLMENT_CLIENT = mock.MagicMock()
-MOCK_SUBSCRIPTION_CLIENT = mock.MagicMock()
-
 # TODO: hammer this out.  Do we want this to be the name of a joinable table name?  Do we want it to reflect the field
 # name of the response from the enrollment API?
 OCM_ENROLLMENT_REFERENCE_TYPE = "enterprise_fufillment_source_uuid"
 
+LEDGER_BALANCE_CACHE_NAMESPACE = 'ledger_balance'
+LEDGER_BALANCE_CACHE_TIMEOUT = getattr(settings, 'LEDGER_BALANCE_CACHE_TIMEOUT', 60 * 5)
+ROLE_ASSIGNMENTS_REQUEST_CACHE_NAMESPACE = 'subsidy_role_assignments'
+STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS = getattr(settings, 'STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS', 60 * 10)
+
 
 logger = logging.getLogger(__name__)
 
@@ -84,8 +85,25 @@ class RevenueCategoryChoices:
     )
 
 
-def now():
-    return datetime.now(timezone.utc)
+def ledger_balance_cache_key(ledger_uuid):
+    """
+    Returns a versioned cache key for the balance of the given ledger.
+    """
+    return versioned_cache_key(LEDGER_BALANCE_CACHE_NAMESPACE, ledger_uuid)
+
+
+def invalidate_ledger_balance_cache(ledger_uuid):
+    """
+    Drop the cached balance of the given ledger from all cache tiers.
+    """
+    TieredCache.delete_all_tiers(ledger_balance_cache_key(ledger_uuid))
+
+
+def invalidate_role_assignments_cache():
+    """
+    Drop all role assignments cached for the current request.
+    """
+    request_cache(namespace=ROLE_ASSIGNMENTS_REQUEST_CACHE_NAMESPACE).clear()
 
 
 class ActiveSubsidyManager(models.Manager):
@@ -350,7 +368,24 @@ class Subsidy(TimeStampedModel):
             raise
 
     def current_balance(self):
-        return self.ledger.balance()
+        """
+        Returns the current balance of this subsidy's ledger.
+
+        The balance is an aggregate over every transaction in the ledger, so it is cached for
+        ``LEDGER_BALANCE_CACHE_TIMEOUT`` seconds (0 disables caching), and the cache is invalidated whenever a
+        transaction or reversal in the ledger is saved.  This is only used for read-side
+        checks; ``openedx_ledger.api.create_transaction()`` always re-computes the balance under the ledger lock
+        before writing.
+        """
+        cache_key = ledger_balance_cache_key(self.ledger_id)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            return cached_response.value
+
+        balance = self.ledger.balance()
+        if LEDGER_BALANCE_CACHE_TIMEOUT:
+            TieredCache.set_all_tiers(cache_key, balance, django_cache_timeout=LEDGER_BALANCE_CACHE_TIMEOUT)
+        return balance
 
     @property
     def total_deposits(self):
@@ -519,7 +554,7 @@ class Subsidy(TimeStampedModel):
             content_title = content_metadata_summary.get('content_title')
             parent_content_key = content_metadata_summary.get('content_key')
 
-            transaction = self._create_redemption(
+            transaction, created = self._create_redemption(
                 lms_user_id,
                 content_key,
                 parent_content_key,
@@ -540,7 +575,7 @@ class Subsidy(TimeStampedModel):
             # info back to the caller.
             raise exc
         if transaction:
-            return (transaction, True)
+            return (transaction, created)
         else:
             logger.info(
                 f'{self} could not redeem {content_key} with price {content_price} '
@@ -586,9 +621,21 @@ class Subsidy(TimeStampedModel):
         transaction record and the enrollment record.  The Transaction model provides a `reference_id` field for this
         purpose.
 
+        Concurrent redemptions: the ledger enforces uniqueness on (ledger, idempotency_key), so a concurrent request
+        for the same redemption gets back the transaction created by the first request.  If that transaction is
+        committed (and not reversed) it is returned as-is.  Otherwise, the request claims the transaction by moving it
+        to pending in a single conditional UPDATE, and only the request that wins the claim goes on to enroll.  A
+        transaction left pending for longer than ``STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS`` (e.g. by a crashed
+        worker) may be claimed again.
+
+        Returns:
+            tuple(openedx_ledger.models.Transaction, bool): The committed transaction, and True if it was created and
+            fulfilled by this call (as opposed to a concurrent request with the same idempotency key).
+
         Raises:
             openedx_ledger.models.LedgerLockAttemptFailed:
-                Raises this if there's another attempt in process to add a transaction to this Ledger.
+                Raises this if there's another attempt in process to add a transaction to this Ledger, or if another
+                request holds the claim on a transaction with the same idempotency key.
             openedx_ledger.api.LedgerBalanceExceeded:
                 Raises this if the transaction would cause the balance of the ledger to become negative.
             Exception:
@@ -617,7 +664,23 @@ class Subsidy(TimeStampedModel):
             **tx_metadata,
         )
 
-        # Progress the transaction to a pending state to indicate that we're now attempting enrollment.
+        # Only a committed transaction can have been reversed, so skip the reverse one-to-one query otherwise.
+        is_reversed = (
+            ledger_transaction.state == TransactionStateChoices.COMMITTED and hasattr(ledger_transaction, 'reversal')
+        )
+        if ledger_transaction.state == TransactionStateChoices.COMMITTED and not is_reversed:
+            logger.info(
+                f'Transaction {ledger_transaction.uuid} with idempotency key {idempotency_key} was already committed.'
+            )
+            return ledger_transaction, False
+
+        if not self._claim_transaction_for_fulfillment(ledger_transaction, is_reversed):
+            raise LedgerLockAttemptFailed(
+                f'Transaction {ledger_transaction.uuid} with idempotency key {idempotency_key} '
+                'is already being fulfilled by another request.'
+            )
+
+        # Save the claimed pending state through the model too, so that history and signal receivers see it.
         ledger_transaction.state = TransactionStateChoices.PENDING
         ledger_transaction.save()
 
@@ -645,7 +708,29 @@ class Subsidy(TimeStampedModel):
             self.rollback_transaction(ledger_transaction, external_transaction_reference)
             raise exc
 
-        return ledger_transaction
+        return ledger_transaction, True
+
+    def _claim_transaction_for_fulfillment(self, ledger_transaction, is_reversed=False):
+        """
+        Atomically move the given transaction to pending, so that exactly one request goes on to fulfill it.
+
+        A transaction can be claimed if it is created or failed, if it is committed but was since reversed, or if
+        it has been pending for longer than ``STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS``.
+
+        Returns:
+            bool: True if this call claimed the transaction.
+        """
+        claimable_states = [TransactionStateChoices.CREATED, TransactionStateChoices.FAILED]
+        if is_reversed:
+            claimable_states.append(TransactionStateChoices.COMMITTED)
+        now = localized_utcnow()
+        stale_cutoff = now - timedelta(seconds=STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS)
+        claimed_count = Transaction.objects.filter(
+            models.Q(state__in=claimable_states)
+            | models.Q(state=TransactionStateChoices.PENDING, modified__lt=stale_cutoff),
+            uuid=ledger_transaction.uuid,
+        ).update(state=TransactionStateChoices.PENDING, modified=now)
+        return claimed_count == 1
 
     def validate_requested_price(self, content_key, requested_price_cents, canonical_price_cents):
         """
@@ -718,8 +803,13 @@ class Subsidy(TimeStampedModel):
         ).first()
 
     def all_transactions(self):
+        """
+        Return all transactions in this subsidy's ledger, joined with the reversal and ledger
+        (read by ``TransactionSerializer``) to avoid a query per serialized transaction.
+        """
         return self.ledger.transactions.select_related(
             'reversal',
+            'ledger',
         )
 
     def transactions_for_learner(self, lms_user_id):
@@ -804,6 +894,32 @@ class EnterpriseSubsidyRoleAssignment(UserRoleAssignment):
             return str(self.enterprise_id)
         return ALL_ACCESS_CONTEXT
 
+    @classmethod
+    def get_assignments(cls, user, role_names=None):
+        """
+        Return iterator of (role name, context) for the user's assignments, optionally limited to ``role_names``.
+
+        Each rules predicate asks about a single role, so one permission check can call this several times.
+        All of the user's assignments are fetched with one query and cached for the rest of the request.
+        """
+        if user.is_anonymous:
+            return
+        cache = request_cache(namespace=ROLE_ASSIGNMENTS_REQUEST_CACHE_NAMESPACE)
+        cached_response = cache.get_cached_response(user.id)
+        if cached_response.is_found:
+            assignments = cached_response.value
+        else:
+            assignments = [
+                (assignment.role.name, assignment.get_context())
+                for assignment in cls.objects.filter(user_id=user.id).select_related('role').only(
+                    'enterprise_id', 'role__name',
+                )
+            ]
+            cache.set(user.id, assignments)
+        for role_name, context in assignments:
+            if not role_names or role_name in role_names:
+                yield role_name, context
+
     @classmethod
     def user_assignments_for_role_name(cls, user, role_name):
         """
@@ -1,12 +1,19 @@
 """
 Signals related to operations on ``subsidy`` models.
 """
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from openedx_ledger.api import create_ledger
-from openedx_ledger.models import SalesContractReferenceProvider
+from openedx_ledger.models import Reversal, SalesContractReferenceProvider, Transaction
 
-from .models import Subsidy, SubsidyReferenceChoices
+from .models import (
+    EnterpriseSubsidyRoleAssignment,
+    Subsidy,
+    SubsidyReferenceChoices,
+    invalidate_ledger_balance_cache,
+    invalidate_role_assignments_cache
+)
 
 
 @receiver(pre_save, sender=Subsidy)
@@ -43,3 +50,45 @@ def subsidy_pre_save(sender, instance, *args, **kwargs):  # pylint: disable=unus
         sales_contract_reference_id=instance.reference_id,
         sales_contract_reference_provider=sales_contract_reference_provider,
     )
+
+
+def _invalidate_cached_balance(ledger_uuid):
+    """
+    Invalidate the cached ledger balance now, and again once the surrounding
+    database transaction commits.
+
+    This narrows, but does not close, the window for a stale balance: a request that
+    computed the balance before the commit can still cache it after the on-commit
+    delete, and that value is served until ``LEDGER_BALANCE_CACHE_TIMEOUT`` expires.
+    """
+    if not ledger_uuid:
+        return
+    invalidate_ledger_balance_cache(ledger_uuid)
+    transaction.on_commit(lambda: invalidate_ledger_balance_cache(ledger_uuid))
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def transaction_balance_changed(sender, instance, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Any write to a Transaction may change its ledger's balance.
+    """
+    _invalidate_cached_balance(instance.ledger_id)
+
+
+@receiver(post_save, sender=Reversal)
+@receiver(post_delete, sender=Reversal)
+def reversal_balance_changed(sender, instance, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Any write to a Reversal may change the balance of its transaction's ledger.
+    """
+    _invalidate_cached_balance(instance.transaction.ledger_id)
+
+
+@receiver(post_save, sender=EnterpriseSubsidyRoleAssignment)
+@receiver(post_delete, sender=EnterpriseSubsidyRoleAssignment)
+def role_assignment_changed(sender, instance, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Role assignments are cached for the duration of a request; drop them when one changes.
+    """
+    invalidate_role_assignments_cache()
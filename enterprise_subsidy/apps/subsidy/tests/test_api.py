@@ -11,6 +11,7 @@ from django.utils import timezone
 from openedx_ledger.models import Reversal, TransactionStateChoices, UnitChoices
 from openedx_ledger.test_utils.factories import TransactionFactory
 
+from enterprise_subsidy.apps.api.v1.serializers import TransactionSerializer
 from enterprise_subsidy.apps.subsidy import api as subsidy_api
 
 from .factories import SubsidyFactory
@@ -172,3 +173,21 @@ class CanRedeemTestCase(TestCase):
         self.assertEqual(expected_active, actual_active)
         self.assertEqual(expected_price, actual_price)
         self.assertEqual([existing_transaction], actual_transactions)
+
+    def test_transactions_serialized_without_n_plus_one(self):
+        """
+        Tests that serializing the returned transactions does not issue a query per transaction.
+        """
+        for _ in range(3):
+            TransactionFactory.create(
+                state=TransactionStateChoices.FAILED,
+                quantity=-19998,
+                ledger=self.subsidy.ledger,
+                lms_user_id=self.lms_user_id,
+                content_key=self.content_key
+            )
+        _, _, _, actual_transactions = subsidy_api.can_redeem(self.subsidy, self.lms_user_id, self.content_key)
+
+        with self.assertNumQueries(0):
+            serialized = TransactionSerializer(actual_transactions, many=True).data
+        self.assertEqual(len(serialized), 3)
@@ -2,7 +2,9 @@
 Tests for functionality provided in the ``models.py`` module.
 """
 import random
+from datetime import timedelta
 from itertools import product
+from types import SimpleNamespace
 from unittest import mock
 from uuid import uuid4
 
@@ -10,19 +12,29 @@ import ddt
 import pytest
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from openedx_ledger.models import Transaction, TransactionStateChoices
+from edx_django_utils.cache import TieredCache
+from openedx_ledger.models import LedgerLockAttemptFailed, Transaction, TransactionStateChoices
 from openedx_ledger.test_utils.factories import (
     ExternalFulfillmentProviderFactory,
     ExternalTransactionReferenceFactory,
+    ReversalFactory,
     TransactionFactory
 )
 from requests.exceptions import HTTPError
 from rest_framework import status
 
+from enterprise_subsidy.apps.content_metadata.api import content_metadata_for_customer_cache_key
+from enterprise_subsidy.apps.core.utils import localized_utcnow
 from enterprise_subsidy.apps.fulfillment.api import InvalidFulfillmentMetadataException
 from test_utils.utils import MockResponse
 
-from ..models import ContentNotFoundForCustomerException, PriceValidationError, Subsidy
+from ..models import (
+    STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS,
+    ContentNotFoundForCustomerException,
+    PriceValidationError,
+    Subsidy,
+    invalidate_ledger_balance_cache
+)
 from .factories import SubsidyFactory
 
 
@@ -44,6 +56,7 @@ class SubsidyModelReadTestCase(TestCase):
             enterprise_customer_uuid=cls.enterprise_customer_uuid,
         )
         cls.subsidy.content_metadata_api = mock.MagicMock()
+        cls.content_not_found_error = HTTPError(response=MockResponse(None, status.HTTP_404_NOT_FOUND))
         super().setUpTestData()
 
     def tearDown(self):
@@ -98,9 +111,7 @@ class SubsidyModelReadTestCase(TestCase):
         Tests that Subsidy.price_for_content raises ContentNotFoundForCustomerException
         if the content is not part of any catalog for the customer.
         """
-        self.subsidy.content_metadata_api().get_course_price.side_effect = HTTPError(
-            response=MockResponse(None, status.HTTP_404_NOT_FOUND),
-        )
+        self.subsidy.content_metadata_api().get_course_price.side_effect = self.content_not_found_error
 
         with self.assertRaises(ContentNotFoundForCustomerException):
             self.subsidy.price_for_content('some-content-key')
@@ -248,38 +259,79 @@ class SubsidyModelReadTestCase(TestCase):
         )
 
 
+class SubsidyModelPriceCachingTestCase(TestCase):
+    """
+    Tests that content prices are served from the shared content metadata cache.
+    """
+    @mock.patch('enterprise_subsidy.apps.content_metadata.api.EnterpriseCatalogApiClientV2')
+    def test_price_for_content_shared_across_subsidies(self, mock_catalog_client):
+        """
+        Subsidies for the same customer should share cached content metadata, so that
+        pricing the same content for many Subsidy instances makes only one catalog request.
+        """
+        enterprise_customer_uuid = uuid4()
+        content_key = 'edX+DemoX'
+        mock_catalog_client.return_value.get_content_metadata_for_customer.return_value = {
+            'key': content_key,
+            'content_type': 'course',
+            'normalized_metadata_by_run': {},
+            'course_runs': [],
+            'entitlements': [],
+            'product_source': None,
+        }
+        subsidies = SubsidyFactory.create_batch(3, enterprise_customer_uuid=enterprise_customer_uuid)
+        self.addCleanup(
+            TieredCache.delete_all_tiers,
+            content_metadata_for_customer_cache_key(enterprise_customer_uuid, content_key),
+        )
+
+        prices = {subsidy.price_for_content(content_key) for subsidy in subsidies}
+
+        self.assertEqual(prices, {0})
+        self.assertEqual(mock_catalog_client.return_value.get_content_metadata_for_customer.call_count, 1)
+
+
 @ddt.ddt
 class SubsidyModelRedemptionTestCase(TestCase):
     """
     Tests functionality related to redemption on the Subsidy model
     """
-    def setUp(self):
-        self.enterprise_customer_uuid = uuid4()
-        self.subsidy_access_policy_uuid = uuid4()
-        self.subsidy = SubsidyFactory.create(
-            enterprise_customer_uuid=self.enterprise_customer_uuid,
+    @classmethod
+    def setUpTestData(cls):
+        cls.enterprise_customer_uuid = uuid4()
+        cls.subsidy_access_policy_uuid = uuid4()
+        cls.subsidy = SubsidyFactory.create(
+            enterprise_customer_uuid=cls.enterprise_customer_uuid,
         )
+        super().setUpTestData()
+
+    def setUp(self):
+        super().setUp()
         self.subsidy.lms_user_client = mock.MagicMock()
         self.subsidy.lms_user_client.return_value.best_effort_user_data.return_value = {'email': 'edx@example.com'}
-        super().setUp()
+        # Transactions written by earlier tests are rolled back without firing signals,
+        # so drop any balance they left cached for the shared ledger.
+        invalidate_ledger_balance_cache(self.subsidy.ledger_id)
 
     def test_get_committed_transaction_no_reversal(self):
         """
         Tests that get_redemption appropriately filters by learner and content identifiers.
         """
         alice_lms_user_id, bob_lms_user_id = (23, 42)
-        learner_content_pairs = list(product(
+        learner_content_pairs = tuple(product(
             (alice_lms_user_id, bob_lms_user_id),
             ('science-content-key', 'art-content-key'),
         ))
-        for lms_user_id, content_key in learner_content_pairs:
-            TransactionFactory.create(
+        Transaction.objects.bulk_create([
+            TransactionFactory.build(
                 state=TransactionStateChoices.COMMITTED,
                 quantity=-1000,
                 ledger=self.subsidy.ledger,
                 lms_user_id=lms_user_id,
                 content_key=content_key
             )
+            for lms_user_id, content_key in learner_content_pairs
+        ])
 
         for lms_user_id, content_key in learner_content_pairs:
             transaction = self.subsidy.get_committed_transaction_no_reversal(lms_user_id, content_key)
@@ -288,6 +340,32 @@ class SubsidyModelRedemptionTestCase(TestCase):
             self.assertEqual(transaction.quantity, -1000)
             self.assertEqual(transaction.state, TransactionStateChoices.COMMITTED)
 
+    def test_current_balance_cached_until_transaction_saved(self):
+        """
+        Tests that current_balance() is served from cache, and that the cache is
+        invalidated when a transaction is written to the subsidy's ledger.
+        """
+        starting_balance = self.subsidy.current_balance()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.subsidy.current_balance(), starting_balance)
+
+        TransactionFactory.create(
+            state=TransactionStateChoices.COMMITTED,
+            quantity=-1000,
+            ledger=self.subsidy.ledger,
+        )
+
+        self.assertEqual(self.subsidy.current_balance(), starting_balance - 1000)
+
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.LEDGER_BALANCE_CACHE_TIMEOUT', 0)
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.TieredCache.set_all_tiers')
+    def test_current_balance_not_cached_when_timeout_is_zero(self, mock_set_all_tiers):
+        """
+        Tests that a LEDGER_BALANCE_CACHE_TIMEOUT of 0 disables caching of current_balance().
+        """
+        self.subsidy.current_balance()
+        mock_set_all_tiers.assert_not_called()
+
     def test_commit_transaction(self):
         """
         Tests that commit_transaction creates a transaction with the correct state.
@@ -306,23 +384,25 @@ class SubsidyModelRedemptionTestCase(TestCase):
             fulfillment_identifier=fulfillment_identifier,
             external_reference=external_reference,
         )
-        transaction.refresh_from_db()
-        self.assertEqual(
-            transaction.external_reference.first(),
-            external_reference
-        )
-        self.assertEqual(
-            transaction.external_reference.first().external_fulfillment_provider,
-            provider
-        )
+        # One query each for the transaction, its external references, and their providers.
+        with self.assertNumQueries(3):
+            transaction = Transaction.objects.prefetch_related(
+                'external_reference__external_fulfillment_provider',
+            ).get(uuid=transaction.uuid)
+            external_references = list(transaction.external_reference.all())
+            self.assertEqual(external_references, [external_reference])
+            self.assertEqual(external_references[0].external_fulfillment_provider, provider)
+        self.assertEqual(transaction.state, TransactionStateChoices.COMMITTED)
+        self.assertEqual(transaction.fulfillment_identifier, fulfillment_identifier)
 
-    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
-    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
     @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
-    def test_redeem_not_existing(self, mock_get_content_summary, mock_enterprise_client, mock_price_for_content):
+    def test_redeem_not_existing(self, mock_get_content_summary):
         """
         Test Subsidy.redeem() happy path (i.e. the redemption/transaction does not already exist, and calling redeem()
         creates one).
+
+        Collaborators owned by the subsidy are stubbed directly on this test's copy of it, rather than patched on the
+        class.  The content summary is still patched, since the GEAG fulfillment handler also fetches it.
         """
         lms_user_id = 1
         content_key = "course-v1:edX+test+course"
@@ -337,8 +417,8 @@ class SubsidyModelRedemptionTestCase(TestCase):
             'content_price': 10000,
             'geag_variant_id': None,
         }
-        mock_price_for_content.return_value = mock_content_price
-        mock_enterprise_client.enroll.return_value = mock_enterprise_fulfillment_uuid
+        self.subsidy.price_for_content = lambda _: mock_content_price
+        self.subsidy.enterprise_client = SimpleNamespace(enroll=lambda *_: mock_enterprise_fulfillment_uuid)
         new_transaction, transaction_created = self.subsidy.redeem(
             lms_user_id,
             content_key,
@@ -348,6 +428,184 @@ class SubsidyModelRedemptionTestCase(TestCase):
         assert new_transaction.state == TransactionStateChoices.COMMITTED
         assert new_transaction.quantity == -mock_content_price
 
+    @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
+    def test_create_redemption_query_count(self, mock_get_content_summary):
+        """
+        Test the number of queries needed to create and fulfill a brand new redemption.  Notably, the reversal of
+        a transaction that was just created is never looked up.
+        """
+        mock_get_content_summary.return_value = {
+            'content_key': 'course-v1:edX+test+course',
+            'geag_variant_id': None,
+        }
+        self.subsidy.enterprise_client = SimpleNamespace(enroll=lambda *_: str(uuid4()))
+
+        # Savepoints, the balance check, get_or_create of the transaction (with history), the reversal lookup made
+        # when serializing the created event, the claim, then the pending and committed saves (with history).
+        with self.assertNumQueries(16):
+            transaction, created = self.subsidy._create_redemption(  # pylint: disable=protected-access
+                1, 'course-v1:edX+test+course', 'edX+test', 1000, str(uuid4()),
+            )
+
+        assert created
+        assert transaction.state == TransactionStateChoices.COMMITTED
+
+    @ddt.data(TransactionStateChoices.COMMITTED, TransactionStateChoices.PENDING)
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.get_committed_transaction_no_reversal')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
+    @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
+    def test_redeem_concurrent_same_idempotency_key(
+        self,
+        existing_state,
+        mock_get_content_summary,
+        mock_enterprise_client,
+        mock_price_for_content,
+        mock_get_committed_transaction,
+    ):
+        """
+        Test that Subsidy.redeem() does not re-fulfill a transaction that a concurrent request created with the same
+        idempotency key after this request's existence check ran.
+        """
+        idempotency_key = 'concurrent-redemption-key'
+        existing_transaction = TransactionFactory.create(
+            state=existing_state,
+            quantity=-1000,
+            ledger=self.subsidy.ledger,
+            idempotency_key=idempotency_key,
+        )
+        # Simulate the race: the existence check ran before the other request's transaction was committed.
+        mock_get_committed_transaction.return_value = None
+        mock_get_content_summary.return_value = {'content_key': 'course-v1:edX+test+course'}
+        mock_price_for_content.return_value = 1000
+
+        if existing_state == TransactionStateChoices.PENDING:
+            with self.assertRaises(LedgerLockAttemptFailed):
+                self.subsidy.redeem(1, 'course-v1:edX+test+course', str(uuid4()), idempotency_key=idempotency_key)
+        else:
+            transaction, created = self.subsidy.redeem(
+                1, 'course-v1:edX+test+course', str(uuid4()), idempotency_key=idempotency_key,
+            )
+            assert transaction == existing_transaction
+            assert not created
+
+        existing_transaction.refresh_from_db()
+        assert existing_transaction.state == existing_state
+        assert not mock_enterprise_client.enroll.called
+
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.get_committed_transaction_no_reversal')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
+    @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
+    def test_redeem_concurrent_claim_lost(
+        self,
+        mock_get_content_summary,
+        mock_enterprise_client,
+        mock_price_for_content,
+        mock_get_committed_transaction,
+    ):
+        """
+        Test that when two requests both read a claimable transaction, only the one whose conditional update moves
+        it to pending goes on to enroll.
+        """
+        idempotency_key = 'concurrent-claim-key'
+        existing_transaction = TransactionFactory.create(
+            state=TransactionStateChoices.CREATED,
+            quantity=-1000,
+            ledger=self.subsidy.ledger,
+            idempotency_key=idempotency_key,
+        )
+        mock_get_committed_transaction.return_value = None
+        mock_get_content_summary.return_value = {'content_key': 'course-v1:edX+test+course'}
+        mock_price_for_content.return_value = 1000
+
+        original_create_transaction = Subsidy.create_transaction
+
+        def create_transaction_then_lose_race(subsidy, *args, **kwargs):
+            ledger_transaction = original_create_transaction(subsidy, *args, **kwargs)
+            # Another request claims the row after this one has read it as created.
+            Transaction.objects.filter(uuid=ledger_transaction.uuid).update(state=TransactionStateChoices.PENDING)
+            return ledger_transaction
+
+        with mock.patch.object(Subsidy, 'create_transaction', autospec=True) as mock_create_transaction:
+            mock_create_transaction.side_effect = create_transaction_then_lose_race
+            with self.assertRaises(LedgerLockAttemptFailed):
+                self.subsidy.redeem(1, 'course-v1:edX+test+course', str(uuid4()), idempotency_key=idempotency_key)
+
+        existing_transaction.refresh_from_db()
+        assert existing_transaction.state == TransactionStateChoices.PENDING
+        assert not mock_enterprise_client.enroll.called
+
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.get_committed_transaction_no_reversal')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
+    @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
+    def test_redeem_reclaims_stale_pending_transaction(
+        self,
+        mock_get_content_summary,
+        mock_enterprise_client,
+        mock_price_for_content,
+        mock_get_committed_transaction,
+    ):
+        """
+        Test that a transaction left pending for longer than STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS, e.g. by a
+        crashed worker, is claimed and fulfilled by the next redemption with the same idempotency key.
+        """
+        idempotency_key = 'stale-pending-key'
+        existing_transaction = TransactionFactory.create(
+            state=TransactionStateChoices.PENDING,
+            quantity=-1000,
+            ledger=self.subsidy.ledger,
+            idempotency_key=idempotency_key,
+        )
+        Transaction.objects.filter(uuid=existing_transaction.uuid).update(
+            modified=localized_utcnow() - timedelta(seconds=STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS + 1),
+        )
+        mock_get_committed_transaction.return_value = None
+        mock_get_content_summary.return_value = {'content_key': 'course-v1:edX+test+course'}
+        mock_price_for_content.return_value = 1000
+        mock_enterprise_client.enroll.return_value = 'the-fulfillment-uuid'
+
+        transaction, created = self.subsidy.redeem(
+            1, 'course-v1:edX+test+course', str(uuid4()), idempotency_key=idempotency_key,
+        )
+
+        assert transaction == existing_transaction
+        assert created
+        assert transaction.state == TransactionStateChoices.COMMITTED
+        assert transaction.fulfillment_identifier == 'the-fulfillment-uuid'
+        mock_enterprise_client.enroll.assert_called_once()
+
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
+    @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
+    @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
+    def test_redeem_after_reversal(self, mock_get_content_summary, mock_enterprise_client, mock_price_for_content):
+        """
+        Test that redeeming the same content again after the first redemption was reversed re-enrolls the learner,
+        even though the default idempotency key leads back to the original, reversed transaction.
+        """
+        lms_user_id = 1
+        content_key = 'course-v1:edX+test+course'
+        subsidy_access_policy_uuid = str(uuid4())
+        mock_get_content_summary.return_value = {'content_key': content_key}
+        mock_price_for_content.return_value = 1000
+        mock_enterprise_client.enroll.return_value = 'the-fulfillment-uuid'
+
+        first_transaction, first_created = self.subsidy.redeem(lms_user_id, content_key, subsidy_access_policy_uuid)
+        assert first_created
+        ReversalFactory.create(
+            transaction=first_transaction,
+            state=TransactionStateChoices.COMMITTED,
+            quantity=-first_transaction.quantity,
+        )
+
+        second_transaction, second_created = self.subsidy.redeem(lms_user_id, content_key, subsidy_access_policy_uuid)
+
+        assert second_transaction == first_transaction
+        assert second_created
+        assert second_transaction.state == TransactionStateChoices.COMMITTED
+        assert mock_enterprise_client.enroll.call_count == 2
+
     @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.price_for_content')
     @mock.patch('enterprise_subsidy.apps.subsidy.models.Subsidy.enterprise_client')
     @mock.patch("enterprise_subsidy.apps.content_metadata.api.ContentMetadataApi.get_content_summary")
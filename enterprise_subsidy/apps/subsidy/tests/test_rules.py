@@ -129,3 +129,22 @@ class TestSubsidyAdminRBACPermissions(APITestMixin):
         self.set_up_user_by_type(user_type, "implicit", jwt_context_override=str(uuid.uuid4()))
         get_current_request_mock.return_value = self.get_request_with_current_jwt_cookie()
         assert self.user.has_perm(permission, self.enterprise_uuid) == expected_has_perm
+
+    @mock.patch('enterprise_subsidy.apps.subsidy.rules.crum.get_current_request')
+    def test_explicit_assignments_fetched_once_per_request(self, get_current_request_mock):
+        """
+        Test that checking several roles and permissions for the same user only reads
+        role assignments from the database once, and that the cached assignments
+        are dropped when an assignment changes.
+        """
+        self.set_up_user_by_type("learner", "explicit")
+        get_current_request_mock.return_value = self.get_request_with_current_jwt_cookie()
+
+        assert self.user.has_perm(PERMISSION_CAN_READ_TRANSACTIONS, self.enterprise_uuid)
+        with self.assertNumQueries(0):
+            assert self.user.has_perm(PERMISSION_CAN_READ_TRANSACTIONS, self.enterprise_uuid)
+            assert not self.user.has_perm(PERMISSION_CAN_READ_SUBSIDIES, self.enterprise_uuid)
+            assert not self.user.has_perm(PERMISSION_CAN_CREATE_TRANSACTIONS, self.enterprise_uuid)
+
+        self.remove_explicit_db_feature_role()
+        assert not self.user.has_perm(PERMISSION_CAN_READ_TRANSACTIONS, self.enterprise_uuid)
@@ -1,12 +1,14 @@
 """ Top level admin configuration for the subsidy service. """
+from uuid import UUID
 
 from django.contrib import admin
+from django.db.models import Q
 from django.http import HttpResponseRedirect
-from django.urls import re_path, reverse
+from django.urls import path, reverse
 from djangoql.admin import DjangoQLSearchMixin
 from openedx_ledger.admin import LedgerAdmin as BaseLedgerAdmin
 from openedx_ledger.admin import TransactionAdmin as BaseTransactionAdmin
-from openedx_ledger.models import Ledger, Transaction
+from openedx_ledger.models import ExternalTransactionReference, Ledger, Transaction
 
 from enterprise_subsidy.apps.subsidy.models import Subsidy
 from enterprise_subsidy.apps.transaction import views
@@ -75,6 +77,13 @@ class TransactionAdmin(DjangoQLSearchMixin, BaseTransactionAdmin):
         'enterprise_customer_uuid',
     ]
 
+    def get_queryset(self, request):
+        """
+        The base admin's queryset already calls ``select_related('reversal')``, which makes the changelist
+        skip ``list_select_related`` entirely, so join the ledger and subsidy here instead.
+        """
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
     def enterprise_customer_uuid(self, tx_obj):
         return tx_obj.ledger.subsidy.enterprise_customer_uuid
 
@@ -98,6 +107,36 @@ class TransactionAdmin(DjangoQLSearchMixin, BaseTransactionAdmin):
         'ledger__subsidy__enterprise_customer_uuid'
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        A standard (non-DjangoQL) search for a single, complete UUID is answered with exact matches
+        instead of a ``LIKE '%term%'`` scan across every search field.
+
+        The customer and external reference matches are expressed as ``IN`` subqueries rather than
+        joins, so every row matches at most once and Django doesn't need to de-duplicate the results
+        by wrapping the search in a correlated ``EXISTS``.
+        """
+        if self.search_mode_toggle_enabled() and not self.djangoql_search_enabled(request):
+            search_term = search_term.strip()
+            try:
+                search_uuid = UUID(search_term)
+            except ValueError:
+                pass
+            else:
+                queryset = queryset.filter(
+                    Q(uuid=search_uuid) |
+                    Q(subsidy_access_policy_uuid=search_uuid) |
+                    Q(ledger_id=search_uuid) |
+                    Q(ledger_id__in=Subsidy.all_objects.filter(
+                        enterprise_customer_uuid=search_uuid,
+                    ).values('ledger_id')) |
+                    Q(uuid__in=ExternalTransactionReference.objects.filter(
+                        external_reference_id=search_term,
+                    ).values('transaction_id'))
+                )
+                return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
     @admin.action(
         description="Unenroll the learner from the platform representation of the course."
     )
@@ -116,8 +155,8 @@ class TransactionAdmin(DjangoQLSearchMixin, BaseTransactionAdmin):
         Returns the additional urls used by DjangoObjectActions.
         """
         custom_urls = [
-            re_path(
-                r"^([^/]+)/unenroll$",
+            path(
+                "<uuid:transaction_id>/unenroll",
                 self.admin_site.admin_view(views.UnenrollLearnersView.as_view()),
                 name="unenroll"
             ),
@@ -5,7 +5,9 @@ from unittest import mock
 from uuid import uuid4
 
 import pytest
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from openedx_ledger.test_utils.factories import (
     ExternalFulfillmentProviderFactory,
@@ -18,6 +20,7 @@ from rest_framework.test import APITestCase
 from enterprise_subsidy.apps.api_client.enterprise import EnterpriseApiClient
 from enterprise_subsidy.apps.core.models import User
 from enterprise_subsidy.apps.fulfillment.api import GEAGFulfillmentHandler
+from enterprise_subsidy.apps.subsidy.tests.factories import SubsidyFactory
 from test_utils.utils import MockResponse
 
 
@@ -171,3 +174,64 @@ class UnenrollTransactionViewTests(ViewTestBases):
         response = self.client.post(url)
         assert bytes('Error canceling platform fulfillment foobar: 500 Server Error', 'utf-8') in response.content
         assert response.status_code == 400
+
+
+class TransactionAdminChangelistTests(TestCase):
+    """
+    Tests for the Transaction admin changelist.
+    """
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.get_or_create(username='testuser', is_superuser=True, is_staff=True)[0])
+        self.changelist_url = reverse('admin:openedx_ledger_transaction_changelist')
+
+    def _create_transactions(self, count):
+        subsidy = SubsidyFactory.create()
+        for _ in range(count):
+            TransactionFactory.create(ledger=subsidy.ledger, quantity=-100)
+
+    def test_changelist_query_count_independent_of_rows(self):
+        """
+        Test that the ledger and subsidy shown for each row are joined into the changelist query,
+        rather than fetched once per row.
+        """
+        self._create_transactions(2)
+        with CaptureQueriesContext(connection) as few_rows_queries:
+            self.assertEqual(self.client.get(self.changelist_url).status_code, 200)
+
+        self._create_transactions(5)
+        with CaptureQueriesContext(connection) as more_rows_queries:
+            self.assertEqual(self.client.get(self.changelist_url).status_code, 200)
+
+        self.assertEqual(len(few_rows_queries), len(more_rows_queries))
+
+    def test_search_by_uuid_matches_exactly(self):
+        """
+        Test that searching for a complete UUID finds transactions by their own uuid, their policy uuid,
+        their customer uuid, or an external reference id, without a de-duplicating EXISTS subquery,
+        and that partial terms still fall back to the standard search.
+        """
+        subsidy = SubsidyFactory.create()
+        policy_uuid = uuid4()
+        by_policy = TransactionFactory.create(ledger=subsidy.ledger, subsidy_access_policy_uuid=policy_uuid)
+        other = TransactionFactory.create(ledger=SubsidyFactory.create().ledger)
+        external_reference_id = str(uuid4())
+        ExternalTransactionReferenceFactory.create(
+            external_fulfillment_provider=ExternalFulfillmentProviderFactory.create(),
+            transaction=other,
+            external_reference_id=external_reference_id,
+        )
+
+        def search(term, exact=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.changelist_url, {'q': term})
+            self.assertEqual(response.status_code, 200)
+            if exact:
+                self.assertFalse(any('EXISTS' in query['sql'] for query in queries.captured_queries))
+            return set(response.context['cl'].result_list)
+
+        self.assertEqual(search(str(other.uuid)), {other})
+        self.assertEqual(search(str(policy_uuid)), {by_policy})
+        self.assertEqual(search(str(subsidy.enterprise_customer_uuid)), set(subsidy.ledger.transactions.all()))
+        self.assertEqual(search(external_reference_id), {other})
+        self.assertEqual(search(str(other.uuid)[:8], exact=False), {other})
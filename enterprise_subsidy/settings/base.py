@@ -362,6 +362,16 @@ ALLOW_LEDGER_MODIFICATION = False
 # per-view cache timeout settings
 # We can disable caching on this view by setting the value below to 0.
 CONTENT_METADATA_VIEW_CACHE_TIMEOUT_SECONDS = 60 * 15
+# How long the same view remembers that content was not found for a customer.
+CONTENT_METADATA_VIEW_NOT_FOUND_CACHE_TIMEOUT_SECONDS = 60 * 5
+
+# How long a subsidy's computed ledger balance is cached. Saving a transaction or reversal invalidates it,
+# but a stale balance can survive for up to this long; set to 0 to disable caching.
+LEDGER_BALANCE_CACHE_TIMEOUT = 60 * 5
+
+# A redemption transaction left pending for longer than this (e.g. by a crashed worker) may be claimed and
+# fulfilled again by a later request with the same idempotency key.
+STALE_PENDING_TRANSACTION_TIMEOUT_SECONDS = 60 * 10
 
 # disable indexing on history_date
 SIMPLE_HISTORY_DATE_INDEX = False
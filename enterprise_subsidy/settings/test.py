@@ -1,5 +1,3 @@
-import os
-
 from enterprise_subsidy.settings.base import *
 
 # IN-MEMORY TEST DATABASE
@@ -11,6 +9,10 @@ DATABASES = {
         'PASSWORD': '',
         'HOST': '',
         'PORT': '',
+        # No tests use serialized_rollback, so skip dumping the freshly migrated database to a string.
+        'TEST': {
+            'SERIALIZE': False,
+        },
     },
 }
 # END IN-MEMORY TEST DATABASE